@@ -1,12 +1,86 @@
 import io
+import time
 
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
+import xlsxwriter
 
-from scraper import DEFAULT_EXCLUDE_KEYWORDS, collect_jobs
+from scraper import (
+    DEFAULT_EXCLUDE_KEYWORDS,
+    SourceFetchError,
+    collect_raw_jobs,
+    fetch_all_jobs,
+    filter_jobs,
+)
 
 st.set_page_config(page_title="Data Analyst Job Scraper", layout="wide")
 
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_jobs():
+    # Cached without the user filters so changing them never hits the network.
+    # A failed source raises, and exceptions are not cached, so a partial
+    # scrape is never kept.
+    return time.time(), collect_raw_jobs(raise_on_error=True)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_filtered_jobs(
+    fetched_at: float, _jobs: list, countries: tuple, exclude_keywords: tuple
+) -> pd.DataFrame:
+    # Keyed by the raw snapshot's fetch time (the underscore keeps Streamlit
+    # from hashing the job list itself), so filtered results never outlive
+    # or mix scrapes. Filters are sorted tuples so equivalent settings share
+    # an entry.
+    return filter_jobs(
+        _jobs,
+        countries=list(countries),
+        exclude_keywords=list(exclude_keywords),
+    )
+
+
+def load_results(countries, exclude_keywords):
+    try:
+        fetched_at, jobs = load_jobs()
+    except SourceFetchError:
+        # Partial scrapes are shown but not cached. Sources that did respond
+        # are served from the HTTP cache, so only the failed ones refetch.
+        jobs, fetch_errors = fetch_all_jobs()
+        df = filter_jobs(jobs, countries=countries, exclude_keywords=exclude_keywords)
+        return df, fetch_errors
+    df = load_filtered_jobs(
+        fetched_at, jobs, tuple(sorted(countries)), tuple(sorted(exclude_keywords))
+    )
+    return df, []
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def to_excel_bytes(df: pd.DataFrame, chunk_size: int = 10_000) -> bytes:
+    # Stream the frame out in Arrow batches; with constant_memory xlsxwriter
+    # flushes each row to disk, so peak memory is bounded by one batch.
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    output = io.BytesIO()
+    # Scraped values are untrusted text: never turn them into links or formulas.
+    workbook = xlsxwriter.Workbook(
+        output,
+        {
+            "constant_memory": True,
+            "strings_to_urls": False,
+            "strings_to_formulas": False,
+        },
+    )
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, table.column_names, workbook.add_format({"bold": True}))
+    row = 1
+    for batch in table.to_batches(max_chunksize=chunk_size):
+        for values in zip(*(column.to_pylist() for column in batch.columns)):
+            worksheet.write_row(row, 0, values)
+            row += 1
+    workbook.close()
+    return output.getvalue()
+
+
 st.title("Automated Data Analyst Job Scraper")
 
 st.markdown(
@@ -31,6 +105,7 @@ with st.sidebar:
     run_button = st.button("Run Scraper")
 
 status_placeholder = st.empty()
+fetch_errors_placeholder = st.empty()
 results_placeholder = st.empty()
 
 if run_button:
@@ -48,21 +123,29 @@ if run_button:
         exclude_keywords.append("intern")
 
     try:
-        df = collect_jobs(countries=countries or None, exclude_keywords=exclude_keywords)
+        df, fetch_errors = load_results(countries, exclude_keywords)
+        if fetch_errors:
+            fetch_errors_placeholder.warning(
+                "Showing partial results.\n\n"
+                + "\n\n".join(str(error) for error in fetch_errors)
+            )
         if df.empty:
             status_placeholder.warning("No jobs found with the selected filters.")
         else:
             status_placeholder.success(f"Found {len(df)} jobs.")
         results_placeholder.dataframe(df, use_container_width=True)
 
-        output = io.BytesIO()
-        df.to_excel(output, index=False)
-        output.seek(0)
         st.download_button(
             "Download Excel",
-            data=output,
+            data=to_excel_bytes(df),
             file_name="jobs_data.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
+        st.download_button(
+            "Download Parquet",
+            data=df.to_parquet(index=False, compression="zstd"),
+            file_name="jobs_data.parquet",
+            mime="application/vnd.apache.parquet",
+        )
     except Exception as exc:  # noqa: BLE001
         status_placeholder.error(f"Scraper failed: {exc}")
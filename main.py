@@ -41,7 +41,7 @@ def main() -> None:
         exclude_keywords.append("intern")
 
     df = collect_jobs(countries=args.countries, exclude_keywords=exclude_keywords)
-    df.to_excel(args.output, index=False)
+    df.to_excel(args.output, index=False, engine="openpyxl")
 
     print(f"Saved {len(df)} jobs to {args.output}")
 
@@ -1,14 +1,23 @@
-import json
-import random
+import functools
+import re
 import sys
-import time
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Tuple
 
+import orjson
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from dateutil import parser as date_parser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CACHE_NAME = ".scrape_cache"
+CACHE_EXPIRE_AFTER = timedelta(minutes=10)
 
 USER_AGENT = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
@@ -28,7 +37,11 @@ DEFAULT_EXCLUDE_KEYWORDS = [
 ]
 
 
-@dataclass
+class SourceFetchError(Exception):
+    """Raised when a job board could not be fetched or decoded."""
+
+
+@dataclass(frozen=True, slots=True)
 class JobPosting:
     source: str
     title: str
@@ -40,40 +53,112 @@ class JobPosting:
     tech_stack: str
     date_posted: str
     link: str
+    normalized_title: str = field(init=False, repr=False, compare=False)
+    normalized_company: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "normalized_title", normalized_text(self.title))
+        object.__setattr__(
+            self, "normalized_company", normalized_text(self.company)
+        )
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=8192)
 def normalized_text(text: str) -> str:
-    return " ".join(text.lower().split())
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
 
 
-def passes_keyword_filters(title: str, exclude_keywords: Iterable[str]) -> bool:
-    normalized = normalized_text(title)
-    if not any(keyword in normalized for keyword in INCLUDE_KEYWORDS):
+@functools.lru_cache(maxsize=32)
+def _compile_keywords(keywords: Tuple[str, ...]) -> Optional[Pattern[str]]:
+    if not keywords:
+        return None
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+def keyword_pattern(keywords: Iterable[str]) -> Optional[Pattern[str]]:
+    return _compile_keywords(tuple(sorted(set(keywords))))
+
+
+_INCLUDE_RE = re.compile("|".join(re.escape(keyword) for keyword in INCLUDE_KEYWORDS))
+
+
+def _passes_normalized(
+    normalized_title: str, exclude_pattern: Optional[Pattern[str]]
+) -> bool:
+    if not _INCLUDE_RE.search(normalized_title):
         return False
-    if any(keyword in normalized for keyword in exclude_keywords):
+    if exclude_pattern is not None and exclude_pattern.search(normalized_title):
         return False
     return True
 
 
-def within_country_filter(country: str, country_filter: Optional[List[str]]) -> bool:
+def passes_keyword_filters(title: str, exclude_keywords: Iterable[str]) -> bool:
+    return _passes_normalized(normalized_text(title), keyword_pattern(exclude_keywords))
+
+
+def _country_set(country_filter: Optional[List[str]]) -> Optional[FrozenSet[str]]:
     if not country_filter:
+        return None
+    return frozenset(code.upper() for code in country_filter)
+
+
+def _in_country_set(country: str, country_set: Optional[FrozenSet[str]]) -> bool:
+    if not country_set:
         return True
-    return country.upper() in {code.upper() for code in country_filter}
+    return country.upper() in country_set
 
 
-def random_delay() -> None:
-    time.sleep(random.uniform(1, 3))
+def within_country_filter(country: str, country_filter: Optional[List[str]]) -> bool:
+    return _in_country_set(country, _country_set(country_filter))
 
 
-def safe_date(value: Optional[str]) -> str:
-    if not value:
-        return ""
+@functools.lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    session = requests_cache.CachedSession(
+        cache_name=CACHE_NAME,
+        backend="sqlite",
+        expire_after=CACHE_EXPIRE_AFTER,
+        allowable_methods=("GET",),
+    )
+    # Accept-Encoding is left to requests: urllib3 advertises (and decodes)
+    # brotli on top of gzip/deflate whenever the brotli package is installed.
+    session.headers["User-Agent"] = USER_AGENT
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            respect_retry_after_header=True,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date(value: str) -> str:
+    try:
+        return datetime.fromisoformat(value.rstrip("Z")).date().isoformat()
+    except ValueError:
+        pass
     try:
         return date_parser.parse(value).date().isoformat()
     except (ValueError, TypeError):
         return ""
 
 
+def safe_date(value: Optional[str]) -> str:
+    if not value or not isinstance(value, str):
+        return ""
+    return _parse_date(value)
+
+
 def format_salary(employment_types: List[Dict]) -> str:
     if not employment_types:
         return ""
@@ -90,22 +175,32 @@ def format_salary(employment_types: List[Dict]) -> str:
     return "; ".join(salaries)
 
 
+def posting_key(company: str, title: str, country: str) -> Tuple[str, str, str]:
+    # Postings sharing this key pass or fail every filter together, so only
+    # the first of them can ever survive filter_jobs' deduplication.
+    return (normalized_text(company), normalized_text(title), country.upper())
+
+
 def fetch_justjoin_jobs(session: requests.Session) -> List[JobPosting]:
     jobs: List[JobPosting] = []
     url = "https://justjoin.it/api/offers"
     try:
         response = session.get(url, timeout=30)
         response.raise_for_status()
-        payload = response.json()
-    except (requests.RequestException, json.JSONDecodeError) as exc:
-        print(f"[JustJoin] Failed to fetch: {exc}", file=sys.stderr)
-        return jobs
+        payload = orjson.loads(response.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as exc:
+        raise SourceFetchError(f"[JustJoin] Failed to fetch: {exc}") from exc
 
+    seen = set()
     for offer in payload:
         title = offer.get("title") or ""
         company = offer.get("company_name") or ""
-        city = offer.get("city") or ""
-        country = offer.get("country_code") or ""
+        country = sys.intern(offer.get("country_code") or "")
+        key = posting_key(company, title, country)
+        if key in seen:
+            continue
+        seen.add(key)
+        city = sys.intern(offer.get("city") or "")
         remote = "Yes" if offer.get("remote") else "No"
         tech_stack = ", ".join(offer.get("skills") or [])
         date_posted = safe_date(offer.get("published_at"))
@@ -129,38 +224,57 @@ def fetch_justjoin_jobs(session: requests.Session) -> List[JobPosting]:
     return jobs
 
 
+_GERMANTECHJOBS_STRAINER = SoupStrainer(["article", "div", "a"])
+
+# Each field keeps its own fallback order, so an <h2> still wins over an
+# earlier <h3> in the same card.
+_CARD_SELECTOR = soupsieve.compile("article, div.job-card, div.job-listing")
+_CARD_LINK_SELECTOR = soupsieve.compile("a[href*='/jobs/']")
+_TITLE_SELECTORS = tuple(soupsieve.compile(s) for s in ("h2", "h3", ".job-title"))
+_COMPANY_SELECTORS = tuple(
+    soupsieve.compile(s) for s in (".company", ".company-name", ".job-company")
+)
+_LOCATION_SELECTORS = tuple(
+    soupsieve.compile(s) for s in (".location", ".job-location", ".locations")
+)
+_LINK_SELECTOR = soupsieve.compile("a[href]")
+
+
+def _select_first(
+    card: Tag, selectors: Sequence[soupsieve.SoupSieve]
+) -> Optional[Tag]:
+    for selector in selectors:
+        tag = selector.select_one(card)
+        if tag is not None:
+            return tag
+    return None
+
+
 def parse_germantechjobs_html(html: str) -> List[JobPosting]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml", parse_only=_GERMANTECHJOBS_STRAINER)
     jobs: List[JobPosting] = []
+    seen = set()
 
-    cards = soup.select("article, div.job-card, div.job-listing")
+    cards = _CARD_SELECTOR.select(soup)
     if not cards:
-        cards = soup.select("a[href*='/jobs/']")
+        cards = _CARD_LINK_SELECTOR.select(soup)
 
     for card in cards:
-        title_tag = (
-            card.select_one("h2")
-            or card.select_one("h3")
-            or card.select_one(".job-title")
-        )
+        title_tag = _select_first(card, _TITLE_SELECTORS)
         title = title_tag.get_text(strip=True) if title_tag else ""
         if not title:
             continue
-        company_tag = (
-            card.select_one(".company")
-            or card.select_one(".company-name")
-            or card.select_one(".job-company")
-        )
+        company_tag = _select_first(card, _COMPANY_SELECTORS)
         company = company_tag.get_text(strip=True) if company_tag else ""
-        location_tag = (
-            card.select_one(".location")
-            or card.select_one(".job-location")
-            or card.select_one(".locations")
-        )
+        country = "DE"
+        key = posting_key(company, title, country)
+        if key in seen:
+            continue
+        seen.add(key)
+        location_tag = _select_first(card, _LOCATION_SELECTORS)
         location_text = location_tag.get_text(strip=True) if location_tag else ""
         city = location_text
-        country = "DE"
-        link_tag = card if card.name == "a" else card.select_one("a[href]")
+        link_tag = card if card.name == "a" else _LINK_SELECTOR.select_one(card)
         link = link_tag["href"] if link_tag and link_tag.has_attr("href") else ""
         if link and link.startswith("/"):
             link = f"https://germantechjobs.de{link}"
@@ -187,8 +301,7 @@ def fetch_germantechjobs(session: requests.Session, query: str) -> List[JobPosti
         response = session.get(url, params={"search": query}, timeout=30)
         response.raise_for_status()
     except requests.RequestException as exc:
-        print(f"[GermanTechJobs] Failed to fetch: {exc}", file=sys.stderr)
-        return []
+        raise SourceFetchError(f"[GermanTechJobs] Failed to fetch: {exc}") from exc
 
     return parse_germantechjobs_html(response.text)
 
@@ -197,7 +310,7 @@ def deduplicate_jobs(jobs: List[JobPosting]) -> List[JobPosting]:
     seen = set()
     unique_jobs = []
     for job in jobs:
-        key = (normalized_text(job.company), normalized_text(job.title))
+        key = (job.normalized_company, job.normalized_title)
         if key in seen:
             continue
         seen.add(key)
@@ -205,46 +318,87 @@ def deduplicate_jobs(jobs: List[JobPosting]) -> List[JobPosting]:
     return unique_jobs
 
 
+DATAFRAME_COLUMNS = {
+    "Source": "source",
+    "Job Title": "title",
+    "Company": "company",
+    "Salary": "salary",
+    "City": "city",
+    "Country": "country",
+    "Remote": "remote",
+    "Tech Stack": "tech_stack",
+    "Date Posted": "date_posted",
+    "Link": "link",
+}
+
+
+CATEGORICAL_COLUMNS = {"Source", "Country", "Remote"}
+
+
 def build_dataframe(jobs: List[JobPosting]) -> pd.DataFrame:
     return pd.DataFrame(
-        [
-            {
-                "Source": job.source,
-                "Job Title": job.title,
-                "Company": job.company,
-                "Salary": job.salary,
-                "City": job.city,
-                "Country": job.country,
-                "Remote": job.remote,
-                "Tech Stack": job.tech_stack,
-                "Date Posted": job.date_posted,
-                "Link": job.link,
-            }
-            for job in jobs
-        ]
+        {
+            column: pd.Series(
+                [getattr(job, field) for job in jobs],
+                dtype="category"
+                if column in CATEGORICAL_COLUMNS
+                else "string[pyarrow]",
+            )
+            for column, field in DATAFRAME_COLUMNS.items()
+        }
     )
 
 
-def collect_jobs(
-    countries: Optional[List[str]] = None,
-    exclude_keywords: Optional[List[str]] = None,
-) -> pd.DataFrame:
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
+def fetch_all_jobs() -> Tuple[List[JobPosting], List[SourceFetchError]]:
+    session = _get_session()
 
-    jobs: List[JobPosting] = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(fetch_justjoin_jobs, session),
+            executor.submit(fetch_germantechjobs, session, "Data Analyst"),
+        ]
+        jobs: List[JobPosting] = []
+        errors: List[SourceFetchError] = []
+        for future in futures:
+            try:
+                jobs.extend(future.result())
+            except SourceFetchError as exc:
+                errors.append(exc)
+        return jobs, errors
+
+
+def collect_raw_jobs(raise_on_error: bool = False) -> List[JobPosting]:
+    jobs, errors = fetch_all_jobs()
+    if errors and raise_on_error:
+        raise errors[0]
+    for error in errors:
+        print(error, file=sys.stderr)
+    return jobs
 
-    jobs.extend(fetch_justjoin_jobs(session))
-    random_delay()
-    jobs.extend(fetch_germantechjobs(session, "Data Analyst"))
 
+def filter_jobs(
+    jobs: List[JobPosting],
+    countries: Optional[List[str]] = None,
+    exclude_keywords: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    exclude_pattern = keyword_pattern(exclude_keywords or [])
+    country_set = _country_set(countries)
     filtered_jobs = [
         job
         for job in jobs
-        if passes_keyword_filters(job.title, exclude_keywords or [])
-        and within_country_filter(job.country, countries)
+        if _passes_normalized(job.normalized_title, exclude_pattern)
+        and _in_country_set(job.country, country_set)
     ]
 
     filtered_jobs = deduplicate_jobs(filtered_jobs)
 
     return build_dataframe(filtered_jobs)
+
+
+def collect_jobs(
+    countries: Optional[List[str]] = None,
+    exclude_keywords: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    return filter_jobs(
+        collect_raw_jobs(), countries=countries, exclude_keywords=exclude_keywords
+    )